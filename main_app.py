@@ -1,12 +1,9 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import date, time, timedelta
-import requests
-import folium
+import numpy as np
+from datetime import date, datetime, time, timedelta
 from streamlit_folium import st_folium
-import pickle
-from geopy.geocoders import Nominatim
+from weather_utils import load_model, model_predict, get_forecast_data, get_historical_daily_rain, geocode_location, make_map
 
 # ------------------ APP CONFIG ------------------
 st.set_page_config(page_title="EventSky: Event - Weather Planner", page_icon="🌦️", layout="wide")
@@ -20,47 +17,8 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ------------------ MODEL & API FUNCTIONS ------------------
-
-@st.cache_resource
-def load_model(model_path):
-    """Loads the pre-trained XGBoost model from the specified .pkl file."""
-    try:
-        with open(model_path, 'rb') as file:
-            model = pickle.load(file)
-        return model
-    except FileNotFoundError:
-        st.error(f"Error: The model file '{model_path}' was not found. Make sure it's in the same directory.")
-        return None
-    except Exception as e:
-        st.error(f"Error loading the model: {e}")
-        return None
-
-@st.cache_data(ttl="1h")
-def get_forecast_data(latitude, longitude, event_date):
-    """Fetches both hourly and daily forecast data to be used as input for the model."""
-    url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&start_date={event_date}&end_date={event_date}&hourly=temperature_2m,relative_humidity_2m,precipitation_probability&daily=temperature_2m_max,temperature_2m_min,windspeed_10m_max"
-    try:
-        res = requests.get(url)
-        res.raise_for_status()
-        return res.json()
-    except Exception as e:
-        st.error(f"Could not fetch forecast data for the model: {e}")
-        return None
-
-@st.cache_data(ttl="6h")
-def get_historical_daily_rain(latitude, longitude, event_date):
-    """Fetches daily rain totals for the same date for the past 5 years using the API."""
-    history_data = []
-    for i in range(5, 0, -1):
-        past_date = event_date - timedelta(days=i*365)
-        url = f"https://archive-api.open-meteo.com/v1/archive?latitude={latitude}&longitude={longitude}&start_date={past_date}&end_date={past_date}&daily=precipitation_sum"
-        try:
-            res = requests.get(url).json()
-            history_data.append({'Year': past_date.year, 'Rainfall (mm)': res['daily']['precipitation_sum'][0]})
-        except Exception:
-            continue
-    return pd.DataFrame(history_data)
+EVENT_TYPES = ("Picnic", "Concert", "Wedding", "Sports", "Other")
+EVENT_TYPE_IDX = {t: i for i, t in enumerate(EVENT_TYPES)}
 
 # ------------------ SESSION STATE INITIALIZATION ------------------
 if 'latitude' not in st.session_state:
@@ -75,6 +33,42 @@ if 'event_type' not in st.session_state:
     st.session_state.event_type = "Picnic"
 if 'crowd_size' not in st.session_state:
     st.session_state.crowd_size = 500
+if 'last_query' not in st.session_state:
+    st.session_state.last_query = None  # Last geocoded search, so map clicks aren't overwritten
+if 'last_click' not in st.session_state:
+    st.session_state.last_click = None  # Last handled map click, so it isn't re-applied after a new search
+
+# ------------------ FRAGMENTS ------------------
+# Widgets inside a fragment only rerun that fragment; st.rerun() is called when a change
+# affects the forecast, history or suggestions so the rest of the app picks it up.
+
+@st.fragment
+def location_map_fragment():
+    """Map picker; panning and zooming stay local, a new click reruns the app."""
+    st.info("Click on the map to fine-tune the precise spot.")
+    m = make_map(round(st.session_state.latitude, 3), round(st.session_state.longitude, 3))
+    map_data = st_folium(m, width=1200, height=400, key="map")
+
+    if map_data and map_data['last_clicked']:
+        clicked = (map_data['last_clicked']['lat'], map_data['last_clicked']['lng'])
+        if clicked != st.session_state.last_click:
+            st.session_state.last_click = clicked
+            st.session_state.latitude, st.session_state.longitude = clicked
+            st.rerun()
+
+    st.success(f"📍 Location set: Latitude={st.session_state.latitude:.4f}, Longitude={st.session_state.longitude:.4f}")
+
+@st.fragment
+def event_details_fragment():
+    """Event type and crowd size; the crowd slider never reruns the rest of the app."""
+    col1, col2 = st.columns(2)
+    with col1:
+        event_type = st.selectbox("🎉 Event Type:", EVENT_TYPES, index=EVENT_TYPE_IDX[st.session_state.event_type])
+    with col2:
+        st.session_state.crowd_size = st.slider("👥 Expected Crowd:", 1, 5000, st.session_state.crowd_size)
+    if event_type != st.session_state.event_type:
+        st.session_state.event_type = event_type
+        st.rerun()  # Suggestions mention the event type
 
 # ------------------ UI LAYOUT ------------------
 st.title("🌦️ EventSky: Event - Weather Planner")
@@ -91,54 +85,42 @@ with tab1:
     
     # Location Search Bar
     location_name = st.text_input("Search for a location:", "Faridabad, India")
-    geolocator = Nominatim(user_agent="event_weather_app")
-    try:
-        location = geolocator.geocode(location_name)
-        if location:
-            st.session_state.latitude = location.latitude
-            st.session_state.longitude = location.longitude
-            st.success(f"Found '{location.address}'. Map centered.")
-        else:
-            st.warning("Location not found. Please try another search.")
-    except Exception as e:
-        st.error(f"Geocoding service error: {e}")
-
-    st.info("Click on the map to fine-tune the precise spot.")
-    m = folium.Map(location=[st.session_state.latitude, st.session_state.longitude], zoom_start=10)
-    map_data = st_folium(m, width=1200, height=400)
-    
-    if map_data and map_data['last_clicked']:
-        st.session_state.latitude = map_data['last_clicked']['lat']
-        st.session_state.longitude = map_data['last_clicked']['lng']
-    
-    st.success(f"📍 Location set: Latitude={st.session_state.latitude:.4f}, Longitude={st.session_state.longitude:.4f}")
+    if location_name and location_name != st.session_state.last_query:
+        try:
+            location = geocode_location(location_name)
+            # Only mark the search as done once the lookup completes, so service errors are retried
+            st.session_state.last_query = location_name
+            if location:
+                st.session_state.latitude, st.session_state.longitude, address = location
+                st.success(f"Found '{address}'. Map centered.")
+            else:
+                st.warning("Location not found. Please try another search.")
+        except Exception as e:
+            st.error(f"Geocoding service error: {e}")
+
+    location_map_fragment()
     st.markdown("---")
     
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3 = st.columns([1, 1, 2])
     with col1:
         st.session_state.event_date = st.date_input("📅 Event Date", st.session_state.event_date)
     with col2:
         st.session_state.event_time = st.time_input("⏰ Event Time", st.session_state.event_time)
     with col3:
-        st.session_state.event_type = st.selectbox("🎉 Event Type:", ["Picnic", "Concert", "Wedding", "Sports", "Other"], index=["Picnic", "Concert", "Wedding", "Sports", "Other"].index(st.session_state.event_type))
-    with col4:
-        st.session_state.crowd_size = st.slider("👥 Expected Crowd:", 1, 5000, st.session_state.crowd_size)
+        event_details_fragment()
 
 # --- IMPORTANT: Fetch data after the inputs are set in the first tab ---
 forecast_data = get_forecast_data(st.session_state.latitude, st.session_state.longitude, st.session_state.event_date)
 
+# Run the model once per rerun; the dashboard and suggestions both read these results
+prediction_proba, prediction = None, None
+if model and forecast_data and 'daily' in forecast_data:
+    daily_data = forecast_data['daily']
+    prediction_proba, prediction = model_predict(daily_data['temperature_2m_max'][0], daily_data['temperature_2m_min'][0], daily_data['windspeed_10m_max'][0], model)
+
 with tab2:
     st.header(f"Forecast for {st.session_state.event_date}")
-    if model and forecast_data and 'daily' in forecast_data:
-        daily_data = forecast_data['daily']
-        input_df = pd.DataFrame({
-            'temperature_2m_max': [daily_data['temperature_2m_max'][0]],
-            'temperature_2m_min': [daily_data['temperature_2m_min'][0]],
-            'windspeed_10m_max': [daily_data['windspeed_10m_max'][0]]
-        })
-        
-        prediction_proba = model.predict_proba(input_df)[0][1]
-
+    if prediction_proba is not None:
         col1, col2, col3 = st.columns(3)
         col1.metric("Rain Probability (Model)", f"{prediction_proba*100:.1f}%")
         col2.metric("Max Temperature", f"{daily_data['temperature_2m_max'][0]}°C")
@@ -146,14 +128,11 @@ with tab2:
 
         st.markdown("---")
         st.subheader("Hourly Forecast from API")
-        hourly_df = pd.DataFrame(forecast_data['hourly'])
-        hourly_df['time'] = pd.to_datetime(hourly_df['time'])
-        fig, ax = plt.subplots(figsize=(12, 5))
-        ax.plot(hourly_df["time"], hourly_df["precipitation_probability"], marker="o", color="blue", label="API Rain Probability (%)")
-        ax.axvline(x=pd.to_datetime(f"{st.session_state.event_date} {st.session_state.event_time}"), color='r', linestyle='--', label='Event Time')
-        ax.set_title("Hourly Rain Forecast (from API)"); ax.set_xlabel("Hour of Day"); ax.set_ylabel("Rain Probability (%)")
-        ax.grid(True); ax.legend()
-        st.pyplot(fig)
+        times = np.array(forecast_data['hourly']['time'], dtype='datetime64[ns]')
+        probs = np.asarray(forecast_data['hourly']['precipitation_probability'], dtype=np.float32)
+        event_ts = datetime.combine(st.session_state.event_date, st.session_state.event_time)
+        st.line_chart(pd.Series(probs, index=times, name="API Rain Probability (%)"), y_label="Rain Probability (%)")
+        st.caption(f"Event time: {event_ts:%Y-%m-%d %H:%M}")
     else:
         st.warning("Could not load model or forecast data for the dashboard. Please check inputs on the 'Event Input' tab.")
 
@@ -161,27 +140,14 @@ with tab3:
     st.header(f"📊 Rainfall History for {st.session_state.event_date.strftime('%B %d')}")
     history_df = get_historical_daily_rain(st.session_state.latitude, st.session_state.longitude, st.session_state.event_date)
     if history_df is not None and not history_df.empty:
-        fig2, ax2 = plt.subplots()
-        ax2.bar(history_df["Year"].astype(str), history_df["Rainfall (mm)"], color="skyblue")
-        ax2.set_title(f"Total Rainfall on {st.session_state.event_date.strftime('%b %d')} (Past 5 Years)")
-        ax2.set_xlabel("Year"); ax2.set_ylabel("Total Rainfall (mm)")
-        st.pyplot(fig2)
+        st.caption(f"Total Rainfall on {st.session_state.event_date.strftime('%b %d')} (Past 5 Years)")
+        st.bar_chart(history_df.astype({"Year": str}).set_index("Year"), y_label="Total Rainfall (mm)")
     else:
         st.warning("Could not load historical data from the API.")
 
 with tab4:
     st.header("Suggestions for Your Event")
-    if model and forecast_data and 'daily' in forecast_data:
-        daily_data = forecast_data['daily']
-        input_df = pd.DataFrame({
-            'temperature_2m_max': [daily_data['temperature_2m_max'][0]],
-            'temperature_2m_min': [daily_data['temperature_2m_min'][0]],
-            'windspeed_10m_max': [daily_data['windspeed_10m_max'][0]]
-        })
-
-        prediction = model.predict(input_df)[0]
-        prediction_proba = model.predict_proba(input_df)[0][1]
-
+    if prediction_proba is not None:
         col1, col2 = st.columns(2)
         col1.metric("Model Prediction: Will it Rain?", "Yes" if prediction == 1 else "No")
         col2.metric("Chances of Rain", f"{prediction_proba*100:.1f}%")
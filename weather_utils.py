@@ -0,0 +1,158 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
+import json
+import hashlib
+import pickle
+import xgboost as xgb
+
+# ------------------ MODEL & API FUNCTIONS ------------------
+
+@st.cache_resource
+def get_session():
+    """Creates one shared HTTP session so API calls reuse keep-alive connections across reruns."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# On-disk cache of the model in native XGBoost format, so cold starts skip unpickling
+MODEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.model_cache')
+
+def _single_threaded(model):
+    """Pins the model to one thread; for a single-row prediction an OpenMP team is pure overhead."""
+    model.set_params(n_jobs=1)
+    model.get_booster().set_param({'nthread': 1})
+    return model
+
+def _load_native(ubj_path, meta_path, meta):
+    """Loads a native .ubj copy if its meta matches, otherwise returns None."""
+    try:
+        with open(meta_path) as file:
+            if json.load(file) != meta:
+                return None
+        model = xgb.XGBClassifier()
+        model.load_model(ubj_path)
+        return model
+    except Exception:
+        return None  # Missing or unreadable (e.g. a partial write); the caller falls back to the pickle
+
+@st.cache_resource
+def load_model(model_path):
+    """Loads the pre-trained XGBoost model, preferring a verified native .ubj copy over the .pkl file."""
+    try:
+        with open(model_path, 'rb') as file:
+            raw = file.read()
+
+        # Native copies are only used if they came from this exact pickle and xgboost version: first the
+        # committed export next to the .pkl, then the local disk cache
+        base = os.path.splitext(model_path)[0]
+        stem = os.path.basename(base)
+        cached_path = os.path.join(MODEL_CACHE_DIR, stem + '.ubj')
+        meta_path = os.path.join(MODEL_CACHE_DIR, stem + '.meta.json')
+        meta = {'model_sha256': hashlib.sha256(raw).hexdigest(), 'xgboost_version': xgb.__version__}
+        model = _load_native(base + '.ubj', base + '.meta.json', meta)
+        if model is None:
+            model = _load_native(cached_path, meta_path, meta)
+        if model is not None:
+            return _single_threaded(model)
+
+        model = pickle.loads(raw)
+        try:
+            os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+            # Drop the old meta first so a failed save never leaves it vouching for a broken file
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+            model.save_model(cached_path)
+            with open(meta_path, 'w') as file:
+                json.dump(meta, file)
+        except Exception:
+            pass  # Read-only deployments just keep using the pickle
+        return _single_threaded(model)
+    except FileNotFoundError:
+        st.error(f"Error: The model file '{model_path}' was not found. Make sure it's in the same directory.")
+        return None
+    except Exception as e:
+        st.error(f"Error loading the model: {e}")
+        return None
+
+@st.cache_data(ttl="1h")
+def model_predict(tmax, tmin, wmax, _model):
+    """Scores one day of forecast features, returning (rain probability, predicted class)."""
+    # A plain float32 row skips the DataFrame -> DMatrix conversion; feature order matches training
+    # (temperature_2m_max, temperature_2m_min, windspeed_10m_max), so name validation is turned off.
+    x = np.asarray([[tmax, tmin, wmax]], dtype=np.float32)
+    proba = float(_model.get_booster().inplace_predict(x, validate_features=False)[0])
+    return proba, int(proba > 0.5)
+
+# Coordinates are rounded to 0.01° (~1.1 km), well within weather-model resolution, so nearby
+# map clicks share a cache entry instead of each triggering a new API call. Errors are raised by
+# the cached functions (exceptions aren't cached) and reported here, so failures are retried.
+def get_forecast_data(latitude, longitude, event_date):
+    """Fetches the forecast for a location, rounded so nearby points hit the cache."""
+    try:
+        return _get_forecast_cached(round(latitude, 2), round(longitude, 2), event_date)
+    except Exception as e:
+        st.error(f"Could not fetch forecast data for the model: {e}")
+        return None
+
+def get_historical_daily_rain(latitude, longitude, event_date):
+    """Fetches the rain history for a location, rounded so nearby points hit the cache."""
+    try:
+        return _get_historical_daily_rain_cached(round(latitude, 2), round(longitude, 2), event_date)
+    except Exception as e:
+        st.error(f"Could not fetch historical rainfall data: {e}")
+        return pd.DataFrame()
+
+@st.cache_data(ttl="1h")
+def _get_forecast_cached(latitude, longitude, event_date):
+    """Fetches both hourly and daily forecast data to be used as input for the model."""
+    url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&start_date={event_date}&end_date={event_date}&hourly=temperature_2m,relative_humidity_2m,precipitation_probability&daily=temperature_2m_max,temperature_2m_min,windspeed_10m_max"
+    res = get_session().get(url, timeout=(3, 10))
+    res.raise_for_status()
+    return orjson.loads(res.content)
+
+@st.cache_data(ttl="6h")
+def _get_historical_daily_rain_cached(latitude, longitude, event_date):
+    """Fetches daily rain totals for the same date for the past 5 years with a single archive API request."""
+    # Step back whole years at month precision (numpy can't subtract years from a day-precision date),
+    # then re-add the day of month, clamped to the month's end so Feb 29 falls back to Feb 28
+    base = np.datetime64(event_date, 'D')
+    base_month = base.astype('datetime64[M]')
+    months = base_month - np.arange(5, 0, -1) * 12
+    month_ends = (months + 1).astype('datetime64[D]') - 1
+    past_dates = np.minimum(months.astype('datetime64[D]') + (base - base_month.astype('datetime64[D]')), month_ends)
+    url = f"https://archive-api.open-meteo.com/v1/archive?latitude={latitude}&longitude={longitude}&start_date={past_dates.min()}&end_date={past_dates.max()}&daily=precipitation_sum"
+    res = get_session().get(url, timeout=(3, 10))
+    res.raise_for_status()
+    daily = orjson.loads(res.content)['daily']
+    times = np.array(daily['time'], dtype='datetime64[D]')
+    rain = np.asarray(daily['precipitation_sum'], dtype=float)
+    mask = np.isin(times, past_dates) & ~np.isnan(rain)
+    return pd.DataFrame({'Year': times[mask].astype('datetime64[Y]').astype(int) + 1970, 'Rainfall (mm)': rain[mask]})
+
+@st.cache_resource
+def get_geolocator():
+    """Creates the Nominatim geocoder once and shares it across reruns."""
+    from geopy.geocoders import Nominatim
+    return Nominatim(user_agent="event_weather_app", timeout=5)
+
+@st.cache_data(ttl="24h")
+def geocode_location(name):
+    """Resolves a place name to (latitude, longitude, address), or None if it isn't found."""
+    location = get_geolocator().geocode(name)
+    if location is None:
+        return None
+    return location.latitude, location.longitude, location.address
+
+@st.cache_resource(max_entries=32)
+def make_map(latitude, longitude):
+    """Builds the Folium map once per (rounded) location instead of on every rerun."""
+    import folium  # Imported on first use rather than at module import
+    return folium.Map(location=[latitude, longitude], zoom_start=10)